@@ -0,0 +1,45 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# distutils: extra_compile_args = -O3 -march=native -ffp-contract=off -fopenmp
+# distutils: extra_link_args = -fopenmp
+"""Compiled kernel for the eigenvalues of a particle in a box.
+
+Optional replacement of the numba and NumPy kernels in basic_models. Build
+it in place with
+
+    cythonize -i _eigen_kernel.pyx
+
+The kernel is only used, if the compiled module can be imported and its
+KERNEL_VERSION matches the one expected by basic_models. Do not compile
+with -ffast-math and keep -ffp-contract=off, reordering the sums or
+fusing them to FMA instructions breaks exact degeneracies.
+"""
+from cython.parallel cimport prange
+
+# Increase with every change of fill(), together with basic_models
+KERNEL_VERSION = 2
+
+
+cpdef void fill(double[:, :, ::1] out,
+                double prefactor,
+                double coefficient_x,
+                double coefficient_y,
+                double coefficient_z,
+                Py_ssize_t n_x_start,
+                Py_ssize_t n_y_start,
+                Py_ssize_t n_z_start) noexcept:
+    """Fill out with eigenvalues of a particle in a box.
+
+    Same signature as basic_models._fill_eigenvalues_numpy. The outermost
+    axis is distributed over OpenMP threads.
+    """
+    cdef Py_ssize_t a, b, c, i, j, k
+    cdef double term_x, term_xy
+    for a in prange(out.shape[0], nogil=True):
+        i = a + n_x_start
+        term_x = i * i * coefficient_x
+        for b in range(out.shape[1]):
+            j = b + n_y_start
+            term_xy = term_x + j * j * coefficient_y
+            for c in range(out.shape[2]):
+                k = c + n_z_start
+                out[a, b, c] = prefactor * (term_xy + k * k * coefficient_z)
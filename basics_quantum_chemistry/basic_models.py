@@ -4,12 +4,275 @@ This module contains different basic models of quantum mechanics.
 
 Content:
     - Particle in a Box: ParticleBox
+    - Conversion of energy units: convert_unit
 """
-from typing import Dict, List, Set
-from scipy import constants
-from matplotlib import pyplot as plt
+from typing import Callable, Iterator, List, Optional, Tuple
+import functools
+import heapq
+import itertools
+import math
+import warnings
 import numpy as np
 
+# Planck constant [J s], exact in SI since 2019. Defined here to avoid
+# importing scipy only for this value.
+_H = 6.62607015e-34
+
+# Version of fill() in _eigen_kernel.pyx this module works with
+_EIGEN_KERNEL_VERSION = 2
+
+# Energy units in Joule. Exact in SI except Hartree (CODATA 2022).
+_AVOGADRO = 6.02214076e23
+_ENERGY_IN_JOULE = {
+    'J': 1.0,
+    'eV': 1.602176634e-19,
+    'kJ/mol': 1e3 / _AVOGADRO,
+    'kcal/mol': 4.184e3 / _AVOGADRO,
+    'Hartree': 4.3597447222060e-18,
+    'cm^-1': _H * 299792458.0 * 1e2,
+}
+# Conversion factors for all pairs of units, calculated once at import
+_FACTORS = {(unit, target_unit): in_joule / target_in_joule
+            for unit, in_joule in _ENERGY_IN_JOULE.items()
+            for target_unit, target_in_joule in _ENERGY_IN_JOULE.items()}
+
+
+def convert_unit(target_unit: str, number, unit: str = 'J'):
+    """Convert energies to another unit.
+
+    Parameters
+    ----------
+    target_unit : str
+        Unit to convert to. One of 'J', 'eV', 'kJ/mol', 'kcal/mol',
+        'Hartree' and 'cm^-1'.
+    number : float or numpy.ndarray of float
+        Energies in unit. Arrays of any shape are converted with a single
+        multiplication.
+    unit : str, default='J'
+        Unit of number, same choices as target_unit.
+
+    Returns
+    -------
+    float or numpy.ndarray of float
+        Energies in target_unit.
+
+    Examples
+    --------
+    >>> print(convert_unit('J', 1.0, 'eV'))
+    1.602176634e-19
+    """
+    try:
+        factor = _FACTORS[(unit, target_unit)]
+    except KeyError:
+        raise ValueError(f'Unknown energy unit, expected one of '
+                         f'{list(_ENERGY_IN_JOULE)}') from None
+    return number * factor
+
+
+def _fill_eigenvalues_numpy(out: np.ndarray,
+                            prefactor: float,
+                            coefficient_x: float,
+                            coefficient_y: float,
+                            coefficient_z: float,
+                            n_x_start: int,
+                            n_y_start: int,
+                            n_z_start: int) -> None:
+    """Fill out with eigenvalues of a particle in a box, NumPy version.
+
+    The prefactor and coefficients are the ones of _calc_coefficients().
+    out[0, 0, 0] corresponds to the principle quantum numbers (n_x_start,
+    n_y_start, n_z_start). Used if neither the compiled kernel nor numba is
+    installed, the other kernels have the same signature.
+    """
+    size_x, size_y, size_z = out.shape
+    range_x = np.arange(n_x_start, n_x_start + size_x, dtype=float)
+    range_y = np.arange(n_y_start, n_y_start + size_y, dtype=float)
+    range_z = np.arange(n_z_start, n_z_start + size_z, dtype=float)
+    np.add.outer(np.add.outer(range_x*range_x*coefficient_x,
+                              range_y*range_y*coefficient_y),
+                 range_z*range_z*coefficient_z,
+                 out=out)
+    out *= prefactor
+
+
+def _load_cython_kernel():
+    """Return the compiled kernel of _eigen_kernel.pyx, None if not built.
+
+    Builds of an outdated _eigen_kernel.pyx are ignored with a warning.
+    """
+    try:
+        import _eigen_kernel
+    except ImportError:
+        return None
+    if getattr(_eigen_kernel, 'KERNEL_VERSION', None) != _EIGEN_KERNEL_VERSION:
+        warnings.warn(f'Ignoring outdated build {_eigen_kernel.__file__}, '
+                      f'rebuild it with cythonize -i _eigen_kernel.pyx',
+                      RuntimeWarning)
+        return None
+    return _eigen_kernel.fill
+
+
+def _load_numba_kernel():
+    """Return the kernel compiled by numba, None if numba is not installed.
+
+    The loop has the same signature as _fill_eigenvalues_numpy. It is
+    compiled without fastmath, reordering the sums would break exact
+    degeneracies.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True, parallel=True)
+    def fill_eigenvalues(out, prefactor, coefficient_x, coefficient_y,
+                         coefficient_z, n_x_start, n_y_start, n_z_start):
+        size_x, size_y, size_z = out.shape
+        for a in numba.prange(size_x):
+            i = a + n_x_start
+            term_x = i*i*coefficient_x
+            for b in range(size_y):
+                j = b + n_y_start
+                term_xy = term_x + j*j*coefficient_y
+                for c in range(size_z):
+                    k = c + n_z_start
+                    out[a, b, c] = prefactor * (term_xy + k*k*coefficient_z)
+
+    return fill_eigenvalues
+
+
+@functools.lru_cache(maxsize=None)
+def _load_fill_eigenvalues():
+    """Return the fastest installed kernel filling eigenvalue grids.
+
+    The compiled kernel is preferred over numba and numba over NumPy. The
+    kernel is selected on first use, so importing this module does not
+    import numba.
+    """
+    for load_kernel in (_load_cython_kernel, _load_numba_kernel):
+        kernel = load_kernel()
+        if kernel is not None:
+            return kernel
+    return _fill_eigenvalues_numpy
+
+
+def _calc_coefficients(mass: float,
+                       length_x: float,
+                       length_y: Optional[float],
+                       length_z: Optional[float]
+                       ) -> Tuple[float, float, float, float]:
+    """Calculate the loop invariant coefficients of the eigenvalues.
+
+    The coefficients are taken relative to the x direction: the prefactor
+    is h^2 / (8 m L_x^2) and each direction gets (L_x / L)^2. For a
+    direction with the same length as x this is exactly 1.0, so the sum
+    over the n^2 of these directions is an exact integer and degenerated
+    eigenvalues of boxes with equal lengths remain equal. For different
+    lengths the terms are rounded separately, see the tolerance of
+    ParticleBox.determine_degeneracy().
+
+    Returns
+    -------
+    tuple of float
+        Prefactor h^2 / (8 m L_x^2) and the coefficients (L_x / L)^2 for the
+        spatial directions x, y and z. The coefficient is 0.0 for a missing
+        spatial direction (length None).
+    """
+    length_x2 = length_x * length_x
+    return (_H * _H / (8.0 * mass * length_x2),
+            1.0,
+            0.0 if length_y is None else length_x2 / (length_y * length_y),
+            0.0 if length_z is None else length_x2 / (length_z * length_z))
+
+
+# Grids with more eigenvalues are not cached. Together with the size of the
+# cache this limits the cache to about 128 MB.
+_MAX_CACHED_GRID_SIZE = 2**20
+
+
+@functools.lru_cache(maxsize=16)
+def _calc_grid(mass: float,
+               length_x: float,
+               length_y: float,
+               length_z: float,
+               n_x: Tuple[int, int],
+               n_y: Tuple[int, int],
+               n_z: Tuple[int, int]) -> np.ndarray:
+    """Calculate the array of eigenvalues of a particle in a box.
+
+    Results are cached, repeated calls with the same box and ranges return
+    the same array. The array is therefore read-only. ParticleBox only
+    caches grids up to _MAX_CACHED_GRID_SIZE eigenvalues and calls the
+    uncached _calc_grid.__wrapped__ otherwise. Free the cached grids with
+    clear_cache().
+    """
+    eigenvalues = np.empty((n_x[1] - n_x[0] + 1,
+                            n_y[1] - n_y[0] + 1,
+                            n_z[1] - n_z[0] + 1))
+    _load_fill_eigenvalues()(eigenvalues,
+                             *_calc_coefficients(mass,
+                                                 length_x,
+                                                 length_y,
+                                                 length_z),
+                             n_x[0],
+                             n_y[0],
+                             n_z[0])
+    eigenvalues.setflags(write=False)
+    return eigenvalues
+
+
+def clear_cache() -> None:
+    """Free the eigenvalue grids cached by ParticleBox.calc_eigenvalues()."""
+    _calc_grid.cache_clear()
+
+
+def _find_level_starts(sorted_values: np.ndarray, rtol: float) -> np.ndarray:
+    """Mark the first eigenvalue of each discrete eigenvalue.
+
+    Parameters
+    ----------
+    sorted_values : numpy.ndarray of float
+        Flat array of sorted eigenvalues.
+    rtol : float
+        Eigenvalues closer than rtol relative to their predecessor belong to
+        the same discrete eigenvalue.
+
+    Returns
+    -------
+    numpy.ndarray of bool
+        True, where a new discrete eigenvalue starts.
+    """
+    level_starts = np.empty(sorted_values.size, dtype=bool)
+    level_starts[:1] = True
+    np.greater(np.diff(sorted_values),
+               rtol * np.abs(sorted_values[1:]),
+               out=level_starts[1:])
+    return level_starts
+
+
+@functools.lru_cache(maxsize=None)
+def _load_wavefunction_jax():
+    """Return a JAX kernel for all 2D wavefunction surfaces.
+
+    Same broadcast as ParticleBox._calc_wavefunction, compiled by XLA for
+    the available device, e.g. a GPU. JAX is imported lazily like
+    matplotlib, None is returned if it is not installed.
+    """
+    try:
+        import jax
+        import jax.numpy as jnp
+    except ImportError:
+        return None
+
+    @jax.jit
+    def calc_wavefunction(range_x, range_y, x, y, length_x, length_y, norm):
+        sin_x = norm * jnp.sin(jnp.pi / length_x * jnp.outer(range_x, x))
+        sin_y = jnp.sin(jnp.pi / length_y * jnp.outer(range_y, y))
+        return sin_x[:, None, :, None] * sin_y[None, :, None, :]
+
+    return calc_wavefunction
+
+
 class ParticleBox():
     """Representation of the model 'Particle in a Box'.
 
@@ -20,28 +283,91 @@ class ParticleBox():
         It is set by default to 1.0, because if user only want to print
         wavefuntions, no mass is needed.
     length_x, length_y, length_z : float, default = 1.0
-        Length [] of the box. Up to three-dimensional boxes.
+        Length [] of the box. Up to three-dimensional boxes. length_z or
+        length_y and length_z can be None for a two- or one-dimensional box,
+        the corresponding principle quantum numbers do not contribute to the
+        eigenvalues then.
 
     Methods
     -------
     calc_eigenvalues()
 
     """
+    __slots__ = ('_mass', '_length_x', '_length_y', '_length_z',
+                 'eigenvalues', '_origin', '_eval')
+
     def __init__(self,
                  mass: float = 1.0,
                  length_x: float = 1.0,
-                 length_y: float = 1.0,
-                 length_z: float = 1.0):
+                 length_y: Optional[float] = 1.0,
+                 length_z: Optional[float] = 1.0):
         self._mass = mass
         self._length_x = length_x
         self._length_y = length_y
         self._length_z = length_z
+        self.eigenvalues = None
+        self._origin = (0, 0, 0)
+        self._eval = None
+
+    def _coefficients(self) -> Tuple[float, float, float, float]:
+        """Calculate the loop invariant coefficients of this box.
+
+        See the module function _calc_coefficients().
+        """
+        return _calc_coefficients(self._mass,
+                                  self._length_x,
+                                  self._length_y,
+                                  self._length_z)
+
+    def _make_evaluator(self,
+                        use_y: bool = True,
+                        use_z: bool = True) -> Callable[..., float]:
+        """Create a function calculating single eigenvalues of this box.
 
+        The function is specialised to the dimension of the box, so a
+        one-dimensional box only evaluates the term of n_x. All coefficients
+        are calculated once and bound to the function.
+
+        Parameters
+        ----------
+        use_y, use_z : bool, default=True
+            False, if the principle quantum number n_y or n_z is always 0,
+            e.g. for the default ranges [0, 0] of a 1D box with the default
+            lengths. The term is skipped then. Missing spatial directions
+            (length None) are always skipped.
+
+        Returns
+        -------
+        callable
+            Function of the principle quantum numbers (n_x, n_y=0, n_z=0)
+            returning the eigenvalue.
+        """
+        prefactor, coefficient_x, coefficient_y, coefficient_z = (
+            self._coefficients())
+        use_y = use_y and self._length_y is not None
+        use_z = use_z and self._length_z is not None
+
+        if not use_y and not use_z:
+            def eigenvalue_1d(n_x, n_y=0, n_z=0):
+                return prefactor * (n_x*n_x*coefficient_x)
+            return eigenvalue_1d
+
+        if not use_z:
+            def eigenvalue_2d(n_x, n_y=0, n_z=0):
+                return prefactor * (n_x*n_x*coefficient_x
+                                    + n_y*n_y*coefficient_y)
+            return eigenvalue_2d
+
+        def eigenvalue_3d(n_x, n_y=0, n_z=0):
+            return prefactor * (n_x*n_x*coefficient_x
+                                + n_y*n_y*coefficient_y
+                                + n_z*n_z*coefficient_z)
+        return eigenvalue_3d
 
     def _calc_eigenvalue(self,
                          n_x: int,
-                         n_y: int,
-                         n_z: int) -> float:
+                         n_y: int = 0,
+                         n_z: int = 0) -> float:
         """Calculate a single eigenvalue of a particle in a box.
 
         Parameters
@@ -56,31 +382,35 @@ class ParticleBox():
 
         Examples
         --------
-        >>> from typing import Dict, List
-        >>> from scipy import constants
-
         First Example
         >>> new_ParticleBoxA = ParticleBox()
-        >>> eigenvalue_a = new_ParticleBoxA.calc_eigenvalue(1, 1, 1)
+        >>> eigenvalue_a = new_ParticleBoxA._calc_eigenvalue(1, 1, 1)
         >>> print(eigenvalue_a)
         1.6464302112270383e-67
 
         Second Example
         >>> new_ParticleBoxB = ParticleBox()
-        >>> eigenvalue_b = new_ParticleBoxB.calc_eigenvalue(2, 2, 2)
+        >>> eigenvalue_b = new_ParticleBoxB._calc_eigenvalue(2, 2, 2)
         >>> print(eigenvalue_b)
-        4.116075528067596e-68
+        6.585720844908153e-67
         """
-        return ((constants.h**2 / (8 * self._mass))
-                * ((n_x/self._length_x)**2
-                   + (n_y/self._length_y)**2
-                   + (n_z/self._length_z)**2))
+        # Built on first use, ParticleBox(0, 1) is valid for wavefunctions.
+        if self._eval is None:
+            self._eval = self._make_evaluator()
+        return self._eval(n_x, n_y, n_z)
 
     def calc_eigenvalues(self,
                            n_x: List = [1, 1],
                            n_y: List = [0, 0],
-                           n_z: List = [0, 0]) -> Dict:
-        """Calculate n eigenvalues of a particle in a box and returns a Dict.
+                           n_z: List = [0, 0]) -> np.ndarray:
+        """Calculate n eigenvalues of a particle in a box and returns an array.
+
+        The array is also stored as attribute eigenvalues. Principle quantum
+        numbers are implicit by position, use get() to access a single
+        eigenvalue by its principle quantum numbers. Results are cached for
+        equal boxes and ranges, so the array is read-only. Copy it before
+        modifying. Grids with more than _MAX_CACHED_GRID_SIZE eigenvalues
+        are not cached, call clear_cache() to free the cache.
 
         Parameters
         ----------
@@ -93,101 +423,437 @@ class ParticleBox():
 
         Returns
         -------
-        dict of {str : float}
-            Dictionary items consist of principle quantum number and
-            corresponding eigenvalue.
+        numpy.ndarray of float, shape (N_x, N_y, N_z)
+            Eigenvalues, where index [0, 0, 0] corresponds to the principle
+            quantum numbers (n_x[0], n_y[0], n_z[0]).
 
         Examples
         --------
-        >>> from typing import Dict, List
-        >>> from scipy import constants
-
         First Example
         >>> new_ParticleBoxA = ParticleBox()
-        >>> eigenvalues_a = new_ParicleBoxA.calc_n_eigenvalues()
+        >>> eigenvalues_a = new_ParticleBoxA.calc_eigenvalues()
         >>> print(eigenvalues_a)
-        {(1, 0, 0): 5.488100704090127e-68}
+        [[[5.4881007e-68]]]
 
         Second Example
         >>> new_ParticleBoxB = ParticleBox(1, 2, 2, 2)
-        >>> eigenvalues_b = new_ParticleBoxB.calc_n_eigenvalues([1 , 3])
-        >>> print(eigenvalues_b)
-        {(1, 0, 0): 1.3720251760225318e-68, (2, 0, 0): 5.488100704090127e-68,
-         (3, 0, 0): 1.2348226584202787e-67}
+        >>> eigenvalues_b = new_ParticleBoxB.calc_eigenvalues([1 , 3])
+        >>> print(eigenvalues_b.ravel())
+        [1.37202518e-68 5.48810070e-68 1.23482266e-67]
+        >>> print(new_ParticleBoxB.get(2, 0, 0))
+        5.488100704090127e-68
         """
-        eigenvalues = {}
         # TODO Change code that input single value represent a range. For
         # example range(1) should calculate n for 1. Right now it would
         # calucalte 0, instead user has always to write a list with start and
         # end point. Additionally user have to write a list (1,1), if he only wants
         # to calculate one eigenvalue.
         # Use a genetator.
-        for i in range(n_x[0], n_x[1]+1):
-            for j in range(n_y[0], n_y[1]+1):
-                for k in range(n_z[0], n_z[1]+1):
-                    self.eigenvalues[i, j, k] = self.calc_eigenvalue(i, j, k)
-        return eigenvalues
+        self.eigenvalues = self._grid(n_x, n_y, n_z)
+        self._origin = (n_x[0], n_y[0], n_z[0])
+        return self.eigenvalues
 
+    def get(self, n_x: int, n_y: int, n_z: int) -> float:
+        """Return a calculated eigenvalue by its principle quantum numbers.
 
-    def determine_discrete_eigenvalues(self, eigenvalues: Dict) -> Set:
-        """Returns sorted set of discrete eigenvalues.
+        Parameters
+        ----------
+        n_x, n_y, n_z : int
+            Principal quantum numbers inside the ranges of the last call of
+            calc_eigenvalues().
+
+        Returns
+        -------
+        float
+            Eigenvalue of the eigenstate (n_x, n_y, n_z).
+
+        Raises
+        ------
+        IndexError
+            If no eigenvalues are calculated yet or the principle quantum
+            numbers are outside of the calculated ranges.
+        """
+        if self.eigenvalues is None:
+            raise IndexError('No eigenvalues calculated, call '
+                             'calc_eigenvalues() first')
+        index = tuple(n - origin for n, origin in zip((n_x, n_y, n_z),
+                                                      self._origin))
+        if any(i < 0 or i >= size
+               for i, size in zip(index, self.eigenvalues.shape)):
+            raise IndexError(f'Eigenstate {(n_x, n_y, n_z)} is outside of '
+                             f'the calculated ranges')
+        return float(self.eigenvalues[index])
+
+
+    def _grid(self,
+              n_x: List,
+              n_y: List,
+              n_z: List,
+              cache: bool = True) -> np.ndarray:
+        """Calculate the read-only array of eigenvalues without storing it.
+
+        See calc_eigenvalues() for parameters and return value. Only grids
+        up to _MAX_CACHED_GRID_SIZE eigenvalues are cached and only if cache
+        is True.
+        """
+        size = ((n_x[1] - n_x[0] + 1)
+                * (n_y[1] - n_y[0] + 1)
+                * (n_z[1] - n_z[0] + 1))
+        calc_grid = (_calc_grid if cache and size <= _MAX_CACHED_GRID_SIZE
+                     else _calc_grid.__wrapped__)
+        return calc_grid(self._mass,
+                         self._length_x,
+                         self._length_y,
+                         self._length_z,
+                         tuple(n_x),
+                         tuple(n_y),
+                         tuple(n_z))
+
+    def iter_eigenvalues(self,
+                         n_x: List = [1, 1],
+                         n_y: List = [0, 0],
+                         n_z: List = [0, 0]
+                         ) -> Iterator[Tuple[Tuple[int, int, int], float]]:
+        """Generate eigenstates with eigenvalues in ascending order.
+
+        For non-negative principle quantum numbers the eigenvalue grows with
+        every quantum number. The eigenstates are therefore generated best
+        first with a heap, starting at the lowest state and only expanding
+        the neighbours of generated states. Each state is reached on a single
+        path, first along x, then y, then z, so no record of visited states
+        is needed. Only the heap of candidate states is kept in memory, not
+        the whole grid of eigenvalues.
+
+        Parameters
+        ----------
+        n_x, n_y, n_z : list of int
+            Range [Start, Stop] of each spatial principle quantum number, see
+            calc_eigenvalues().
+
+        Yields
+        ------
+        tuple of (tuple of int, float)
+            Principle quantum numbers and corresponding eigenvalue.
+
+        Examples
+        --------
+        >>> new_ParticleBox = ParticleBox()
+        >>> eigenstates = new_ParticleBox.iter_eigenvalues([1, 9], [1, 9])
+        >>> print(next(eigenstates))
+        ((1, 1, 0), 1.0976201408180254e-67)
+        """
+        starts = (n_x[0], n_y[0], n_z[0])
+        stops = (n_x[1], n_y[1], n_z[1])
+        if any(start > stop for start, stop in zip(starts, stops)):
+            return
+        if min(starts) < 0:
+            # Eigenvalues are not monotonic anymore, sort the whole grid
+            eigenvalues = self._grid(n_x, n_y, n_z, cache=False)
+            for index in np.argsort(eigenvalues, axis=None, kind='stable'):
+                state = np.unravel_index(index, eigenvalues.shape)
+                yield (tuple(int(n + start) for n, start in zip(state, starts)),
+                       float(eigenvalues[state]))
+            return
+
+        # Skip the terms of quantum numbers fixed to 0
+        eigenvalue = self._make_evaluator(use_y=tuple(n_y) != (0, 0),
+                                          use_z=tuple(n_z) != (0, 0))
+        # Heap items are (eigenvalue, state, last incremented axis). Only
+        # axes at or after the last incremented one are incremented, which
+        # pushes every state exactly once.
+        heap = [(eigenvalue(*starts), starts, 0)]
+        while heap:
+            value, state, last_axis = heapq.heappop(heap)
+            yield state, value
+            for axis in range(last_axis, 3):
+                if state[axis] < stops[axis]:
+                    neighbour = list(state)
+                    neighbour[axis] += 1
+                    neighbour = tuple(neighbour)
+                    heapq.heappush(heap, (eigenvalue(*neighbour),
+                                          neighbour,
+                                          axis))
+
+    def top_k(self,
+              k: int,
+              n_x: List = [1, 1],
+              n_y: List = [0, 0],
+              n_z: List = [0, 0]) -> List[Tuple[Tuple[int, int, int], float]]:
+        """Return the k eigenstates with the lowest eigenvalues.
 
         Parameters
         ----------
-        eigenvalues : dict of {set of int : float}
-            Items represent eigenstate with eigenvalues.
+        k : int
+            Number of eigenstates. No eigenstates are returned for k <= 0 or
+            empty ranges.
+        n_x, n_y, n_z : list of int
+            Range [Start, Stop] of each spatial principle quantum number, see
+            calc_eigenvalues().
 
         Returns
         -------
-        set of floats
+        list of (tuple of int, float)
+            Principle quantum numbers and corresponding eigenvalue in
+            ascending order of the eigenvalues.
+        """
+        if k <= 0 or n_x[0] > n_x[1] or n_y[0] > n_y[1] or n_z[0] > n_z[1]:
+            return []
+        if min(n_x[0], n_y[0], n_z[0]) >= 0:
+            return list(itertools.islice(self.iter_eigenvalues(n_x, n_y, n_z),
+                                         k))
+        eigenvalues = self._grid(n_x, n_y, n_z, cache=False).ravel()
+        k = min(k, eigenvalues.size)
+        if k == 0:
+            return []
+        # Equal eigenvalues are taken in the order of the grid, like the
+        # stable sort of iter_eigenvalues()
+        threshold = eigenvalues[np.argpartition(eigenvalues, k - 1)[k - 1]]
+        below = np.flatnonzero(eigenvalues < threshold)
+        equal = np.flatnonzero(eigenvalues == threshold)[:k - below.size]
+        lowest = np.concatenate((below, equal))
+        lowest = lowest[np.argsort(eigenvalues[lowest], kind='stable')]
+        states = np.column_stack(np.unravel_index(
+            lowest, (n_x[1] - n_x[0] + 1,
+                     n_y[1] - n_y[0] + 1,
+                     n_z[1] - n_z[0] + 1))) + (n_x[0], n_y[0], n_z[0])
+        return list(zip(map(tuple, states.tolist()),
+                        eigenvalues[lowest].tolist()))
+
+
+    def determine_discrete_eigenvalues(self,
+                                       eigenvalues: np.ndarray,
+                                       rtol: float = 1e-12) -> np.ndarray:
+        """Returns sorted array of discrete eigenvalues.
+
+        Parameters
+        ----------
+        eigenvalues : numpy.ndarray of float
+            Eigenvalues as returned by calc_eigenvalues().
+        rtol : float, default=1e-12
+            Relative tolerance, see determine_degeneracy().
+
+        Returns
+        -------
+        numpy.ndarray of float
             Different discrete eigenvalues.
         """
-        return sorted({value for value in eigenvalues.values()})
+        sorted_values = np.sort(eigenvalues, axis=None)
+        return sorted_values[_find_level_starts(sorted_values, rtol)]
 
 
-    def determine_degeneracy(self, eigenvalues: Dict) -> Dict:
-        """Determine list of degenerated eigenvalues.
+    def determine_degeneracy(self,
+                             eigenvalues: np.ndarray,
+                             rtol: float = 1e-12
+                             ) -> Tuple[np.ndarray, np.ndarray,
+                                        np.ndarray, np.ndarray]:
+        """Determine the degenerated eigenvalues as parallel arrays.
+
+        The eigenstates are stored like a CSR sparse matrix: the flat
+        indices into eigenvalues of all eigenstates with eigenvalue
+        values[k] are state_indices[offsets[k]:offsets[k+1]]. Use
+        degenerate_states() to decode them to principle quantum numbers.
+
+        Eigenvalues closer than the relative tolerance rtol to their sorted
+        predecessor belong to the same discrete eigenvalue, so degeneracies
+        are not missed because of round-off errors.
+
+        Parameters
+        ----------
+        eigenvalues : numpy.ndarray of float
+            Eigenvalues as returned by calc_eigenvalues().
+        rtol : float, default=1e-12
+            Relative tolerance for degenerated eigenvalues.
+
+        Returns
+        -------
+        values : numpy.ndarray of float, shape (D,)
+            Sorted discrete eigenvalues, the lowest eigenvalue of each group.
+        degeneracies : numpy.ndarray of int, shape (D,)
+            Degree of degeneracy of each discrete eigenvalue.
+        state_indices : numpy.ndarray of int, shape (N,)
+            Flat indices of the eigenstates, grouped by eigenvalue.
+        offsets : numpy.ndarray of int, shape (D + 1,)
+            Start of the group of each eigenvalue in state_indices.
+        """
+        index_type = (np.int32 if eigenvalues.size <= np.iinfo(np.int32).max
+                      else np.int64)
+        # Sort once, degenerated eigenstates are then contiguous runs of
+        # sorted eigenvalues.
+        state_indices = np.argsort(eigenvalues, axis=None, kind='stable')
+        sorted_values = eigenvalues.ravel()[state_indices]
+        level_starts = _find_level_starts(sorted_values, rtol)
+        offsets = np.append(np.flatnonzero(level_starts),
+                            sorted_values.size).astype(index_type)
+        return (sorted_values[level_starts],
+                np.diff(offsets),
+                state_indices.astype(index_type),
+                offsets)
+
+    def degenerate_states(self,
+                          degeneracy: Tuple[np.ndarray, np.ndarray,
+                                            np.ndarray, np.ndarray],
+                          level: int,
+                          n_x: List = [1, 1],
+                          n_y: List = [0, 0],
+                          n_z: List = [0, 0]) -> List[Tuple[int, int, int]]:
+        """Decode the degenerated eigenstates of one discrete eigenvalue.
 
         Parameters
         ----------
-        eigenvalues : dict of {set of int : float}
-            Items represent eigenstate with eigenvalue.
+        degeneracy : tuple of numpy.ndarray
+            Result of determine_degeneracy().
+        level : int
+            Index of the discrete eigenvalue in degeneracy. Negative indices
+            count from the highest discrete eigenvalue.
+        n_x, n_y, n_z : list of int
+            Ranges [Start, Stop] of the principle quantum numbers, which the
+            eigenvalues passed to determine_degeneracy() were calculated for.
 
         Returns
         -------
-        list of (float, int, list of tuple of int)
-            list consist of: eigenvalue, degree of degeneracy, list of set of
-            degenerated eigenstates
+        list of tuple of int
+            Principle quantum numbers of the degenerated eigenstates.
+
+        Raises
+        ------
+        ValueError
+            If the ranges do not match the number of eigenstates in
+            degeneracy.
+        IndexError
+            If level is outside of the discrete eigenvalues.
         """
-        degeneracy = []
-        discrete_eigenvalues = self.determine_discrete_eigenvalues(eigenvalues)
-        for i in discrete_eigenvalues:
-            same_quantum_states = [state for state, value
-                                   in self.eigenvalues.items()
-                                   if value == i]
-            self.degeneracy.append([i,
-                                len(same_quantum_states),
-                                same_quantum_states])
-        return self.degeneracy
+        _, _, state_indices, offsets = degeneracy
+        n_levels = len(offsets) - 1
+        if not -n_levels <= level < n_levels:
+            raise IndexError(f'Level {level} is outside of the {n_levels} '
+                             f'discrete eigenvalues')
+        if level < 0:
+            level += n_levels
+        shape = (n_x[1] - n_x[0] + 1, n_y[1] - n_y[0] + 1, n_z[1] - n_z[0] + 1)
+        if math.prod(shape) != offsets[-1]:
+            raise ValueError(f'Ranges with {math.prod(shape)} eigenstates do '
+                             f'not match the {offsets[-1]} eigenstates of '
+                             f'degeneracy')
+        group = state_indices[offsets[level]:offsets[level + 1]]
+        states = (np.column_stack(np.unravel_index(group, shape))
+                  + (n_x[0], n_y[0], n_z[0]))
+        return list(map(tuple, states.tolist()))
 
     # Draw different plots of a one-dimensional particle in a box
-    def _calc_wavefunction(self, n_x: int, n_y: int):
-        """Calculate the wavefunction for given principle quantun numbers.
+    def _check_wavefunction_box(self) -> None:
+        """Raise ValueError, if the box has no length in y direction.
+
+        2D wavefunctions need both lengths, they can not be plotted for boxes
+        created with length_y None.
+        """
+        if self._length_y is None:
+            raise ValueError('2D wavefunctions need the lengths length_x and '
+                             'length_y of the box, got None')
+
+    def _calc_wavefunction(self,
+                           n_x: List,
+                           n_y: List,
+                           x: np.ndarray,
+                           y: np.ndarray,
+                           use_jax: bool = False) -> np.ndarray:
+        """Calculate the wavefunctions for ranges of principle quantun numbers.
 
         Attention: Because of spatial limitation only 1D and 2D wavefunctions
         can be calculted.
 
+        All surfaces are calculated in one broadcast of the sine values of
+        both spatial directions. The calculation keeps the floating point
+        type of x and y, for example float32 for plotting. Integer grid
+        points are calculated in double precision.
+
         Parameters
         ----------
-        n_x, n_y : int
-            Priniciple quantum numbers for spatial directions x and y.
+        n_x, n_y : list of int
+            Range [Start, Stop] of the priniciple quantum numbers for the
+            spatial directions x and y.
+        x, y : numpy.ndarray of float
+            Grid points in the spatial directions x and y.
+        use_jax : bool, default=False
+            Calculate float32 surfaces with JAX, e.g. to offload very large
+            grids to a GPU. Importing JAX and compiling the kernel for every
+            new shape costs far more than NumPy needs for plotting grids, so
+            NumPy is used by default. NumPy is also used for float64 grids and
+            if JAX is not installed.
 
         Returns
         -------
-        float
-            z-value of the wavefunction.
+        numpy.ndarray of float, shape (N_x, N_y, len(x), len(y))
+            z-values of the wavefunctions, where index [0, 0] corresponds to
+            the principle quantum numbers (n_x[0], n_y[0]).
+
+        Raises
+        ------
+        ValueError
+            If length_y of the box is None.
         """
-        return (np.sqrt(4 / self.length_x * self.length_y)
-                * np.sin(n_x * np.pi * x / self.length_x)
-                * np.sin(n_y * np.pi * y / self.length_y))
+        self._check_wavefunction_box()
+        dtype = np.result_type(x, y, np.float32)
+        # Normalisation constant, applied to the small table of sine values
+        # of x instead of every point of the surfaces
+        norm = dtype.type(math.sqrt(4.0 / (self._length_x * self._length_y)))
+        # JAX computes in single precision by default
+        calc_wavefunction_jax = (_load_wavefunction_jax()
+                                 if use_jax and dtype == np.float32 else None)
+        if calc_wavefunction_jax is not None:
+            return np.asarray(calc_wavefunction_jax(
+                np.arange(n_x[0], n_x[1]+1, dtype=dtype),
+                np.arange(n_y[0], n_y[1]+1, dtype=dtype),
+                x,
+                y,
+                dtype.type(self._length_x),
+                dtype.type(self._length_y),
+                norm))
+        sin_x = norm * np.sin(dtype.type(np.pi / self._length_x)
+                              * np.outer(np.arange(n_x[0], n_x[1]+1,
+                                                   dtype=dtype), x))
+        sin_y = np.sin(dtype.type(np.pi / self._length_y)
+                       * np.outer(np.arange(n_y[0], n_y[1]+1, dtype=dtype), y))
+        return sin_x[:, None, :, None] * sin_y[None, :, None, :]
+
+    def plot_wavefunctions(self,
+                           n_x: List = [1, 1],
+                           n_y: List = [1, 1],
+                           dtype: type = np.float32,
+                           use_jax: bool = False) -> None:
+        """Plot the 2D wavefunctions for ranges of principle quantum numbers.
 
+        Parameters
+        ----------
+        n_x, n_y : list of int
+            Range [Start, Stop] of the priniciple quantum numbers for the
+            spatial directions x and y.
+        dtype : numpy floating point type, default=numpy.float32
+            Floating point type of the plotting grid. Single precision is
+            enough for the screen resolution of the plots.
+        use_jax : bool, default=False
+            Calculate the surfaces with JAX, see _calc_wavefunction().
+
+        Raises
+        ------
+        ValueError
+            If dtype is not a floating point type or length_y of the box is
+            None.
+        """
+        self._check_wavefunction_box()
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(f'dtype has to be a floating point type, '
+                             f'got {dtype}')
+        from matplotlib import pyplot as plt
+
+        x_values = np.linspace(0, self._length_x, 100, dtype=dtype)
+        y_values = np.linspace(0, self._length_y, 100, dtype=dtype)
+        X, Y = np.meshgrid(x_values, y_values, indexing='ij')
+        Z = self._calc_wavefunction(n_x, n_y, x_values, y_values, use_jax)
+        for i, j in np.ndindex(*Z.shape[:2]):
+            fig = plt.figure()
+            ax = fig.add_subplot(projection='3d')
+            ax.plot_surface(X, Y, Z[i, j], cmap='viridis')
+            ax.set_title(f'n_x = {n_x[0] + i}, n_y = {n_y[0] + j}')
+            ax.set_xlabel('x')
+            ax.set_ylabel('y')
+        plt.show()
@@ -1,8 +1,13 @@
 from typing import List, Tuple, Dict, Set
+from collections import defaultdict
+import functools
 import itertools
 from scipy import constants
+import numpy as np
 
 class ParticleBox_1D():
+    __slots__ = ('_mass', '_length')
+
     def __init__(self,
                  mass,
                  length):
@@ -16,9 +21,12 @@ class ParticleBox_1D():
     
     def calc_multi_eigenvalues(self,
                               n: Tuple) -> Dict:
-        eigenvalues = {}
-        for i in range(n[0], n[1] + 1):
-            eigenvalues[i] = self.calc_single_eigenvalue(i)
+        n_range = np.arange(n[0], n[1] + 1)
+        # Calculate all eigenvalues into one buffer and build the dict at
+        # once instead of growing it item by item
+        values = ((constants.h**2 / (8 * self._mass))
+                  * (n_range ** 2 / self._length ** 2))
+        eigenvalues = dict(zip(n_range.tolist(), values.tolist()))
         return eigenvalues
     
     def plot_eigenvalues(self, eigenvalues: dict):
@@ -34,6 +42,8 @@ class ParticleBox_1D():
         pass
     
 class ParticleBox_multiD():
+    __slots__ = ('_mass', '_length')
+
     def __init__(self,
                  mass,
                  length: Tuple):
@@ -51,31 +61,43 @@ class ParticleBox_multiD():
     
     def calc_multi_eigenvalues(self,
                                *n_i: Tuple) -> Dict:
-        eigenvalues = {}
-        for i in itertools.product(*[range(n_spatial[0], n_spatial[1] + 1)
-                                     for n_spatial in n_i]):
-            eigenvalues[i] = self.calc_single_eigenvalue(i)
+        if len(n_i) != len(self._length):
+            raise ValueError(f'Expected {len(self._length)} ranges of '
+                             f'quantum numbers, got {len(n_i)}')
+        ranges = [np.arange(n_spatial[0], n_spatial[1] + 1)
+                  for n_spatial in n_i]
+        # Build the whole multi-dimensional grid with one outer sum per
+        # spatial dimension instead of a Python call per quantum state
+        grid = ((constants.h ** 2 / (8 * self._mass))
+                * functools.reduce(np.add.outer,
+                                   [spatial_range ** 2 / spatial_length ** 2
+                                    for spatial_range, spatial_length
+                                    in zip(ranges, self._length)]))
+        eigenvalues = dict(zip(itertools.product(*[spatial_range.tolist()
+                                                   for spatial_range in ranges]),
+                               np.ravel(grid).tolist()))
         return eigenvalues
 
     def _determine_discrete_eigenvalues(self, eigenvalues: Dict) -> Set:
         return sorted({value for value in eigenvalues.values()})
     
     def determine_degeneracy(self, eigenvalues: Dict) -> Dict:
-        degeneracy = []
-        # Determine discrete eigenvalues for searching degenerated eigenvalues
-        discrete_eigenvalues = self._determine_discrete_eigenvalues(eigenvalues)
-        for i in discrete_eigenvalues:
-            same_quantum_states = [state for state, value
-                                   in eigenvalues.items() if value == i]
-            degeneracy.append([i,
-                               len(same_quantum_states),
-                               same_quantum_states])
+        # Collect degenerated eigenstates in a single pass over all
+        # eigenvalues, each discrete eigenvalue is a bucket
+        same_quantum_states = defaultdict(list)
+        for state, value in eigenvalues.items():
+            same_quantum_states[value].append(state)
+        degeneracy = [[value, len(states), states]
+                      for value, states in same_quantum_states.items()]
+        degeneracy.sort(key=lambda level: level[0])
         return degeneracy
     
     def plot_eigenvalues(self, eigenvalues: dict):
         pass
     
 class ParticleBox_2D(ParticleBox_multiD):
+    __slots__ = ()
+
     def _calc_wavefunction(self, n: Tuple):
         pass
     
@@ -87,4 +109,4 @@ class ParticleBox_2D(ParticleBox_multiD):
     
     
 class ParticleBox_3D(ParticleBox_multiD):
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
@@ -0,0 +1,310 @@
+import numpy as np
+import pytest
+
+import basic_models
+from basic_models import ParticleBox, convert_unit
+
+
+def test_get():
+    test_particle = ParticleBox(1, 2, 2, 2)
+    eigenvalues = test_particle.calc_eigenvalues([1, 3])
+    assert eigenvalues.shape == (3, 1, 1)
+    assert test_particle.get(1, 0, 0) == pytest.approx(1.3720251760225318e-68)
+    assert test_particle.get(2, 0, 0) == pytest.approx(5.488100704090127e-68)
+    assert test_particle.get(3, 0, 0) == pytest.approx(1.2348226584202787e-67)
+
+
+def test_get_outside_of_ranges():
+    test_particle = ParticleBox(1, 2, 2, 2)
+    with pytest.raises(IndexError):
+        test_particle.get(1, 0, 0)
+
+    test_particle.calc_eigenvalues([1, 3])
+    for state in [(0, 0, 0), (-1, 0, 0), (4, 0, 0), (1, 1, 0), (1, 0, -1)]:
+        with pytest.raises(IndexError):
+            test_particle.get(*state)
+
+
+@pytest.mark.parametrize('length', [1.0, 3.0, 0.7])
+def test_degeneracy_equal_lengths_exact(length):
+    test_particle = ParticleBox(1, length, length, length)
+    eigenvalues = test_particle.calc_eigenvalues([1, 20], [1, 20], [1, 20])
+    sums_of_squares = {i*i + j*j + k*k
+                       for i in range(1, 21)
+                       for j in range(1, 21)
+                       for k in range(1, 21)}
+    values = test_particle.determine_discrete_eigenvalues(eigenvalues, rtol=0)
+    assert len(values) == len(sums_of_squares) == 694
+
+
+@pytest.mark.parametrize('ranges', [([1, 6], [0, 5], [2, 7]),
+                                    ([1, 9], [1, 9], [0, 0]),
+                                    ([-2, 2], [0, 1], [0, 0])])
+def test_iter_eigenvalues(ranges):
+    test_particle = ParticleBox(1, 1, 2, 3)
+    eigenvalues = test_particle.calc_eigenvalues(*ranges)
+    eigenstates = list(test_particle.iter_eigenvalues(*ranges))
+    states = [state for state, _ in eigenstates]
+    values = [value for _, value in eigenstates]
+    assert len(set(states)) == len(states) == eigenvalues.size
+    assert values == sorted(values)
+    for state, value in eigenstates:
+        assert test_particle.get(*state) == value
+
+
+def test_iter_eigenvalues_lowest_state():
+    test_particle = ParticleBox()
+    eigenstates = test_particle.iter_eigenvalues([1, 9], [1, 9])
+    state, value = next(eigenstates)
+    assert state == (1, 1, 0)
+    assert value == pytest.approx(1.0976201408180254e-67)
+
+
+@pytest.mark.parametrize('ranges', [([1, 6], [0, 5], [2, 7]),
+                                    ([-2, 2], [0, 1], [0, 0])])
+def test_top_k(ranges):
+    test_particle = ParticleBox(1, 1, 2, 3)
+    eigenstates = list(test_particle.iter_eigenvalues(*ranges))
+    assert test_particle.top_k(5, *ranges) == eigenstates[:5]
+    assert test_particle.top_k(1000, *ranges) == eigenstates
+    assert test_particle.top_k(0, *ranges) == []
+    assert test_particle.top_k(-1, *ranges) == []
+
+
+def test_calc_wavefunction_integer_grid():
+    test_particle = ParticleBox(1, 2, 2)
+    wavefunctions = test_particle._calc_wavefunction([1, 2], [1, 1],
+                                                     np.arange(3),
+                                                     np.arange(3))
+    assert wavefunctions.dtype == np.float64
+    # nodes at the walls and, for n_x = 2, in the middle of the box
+    assert wavefunctions[1, 0, 1, 1] == pytest.approx(0.0, abs=1e-12)
+    assert wavefunctions[0, 0, 1, 1] == pytest.approx(1.0)
+
+
+def test_plot_wavefunctions_rejects_integer_dtype():
+    test_particle = ParticleBox(1, 2, 2)
+    with pytest.raises(ValueError):
+        test_particle.plot_wavefunctions(dtype=int)
+
+
+def test_calc_wavefunction_numpy_by_default(monkeypatch):
+    def load_wavefunction_jax():
+        raise AssertionError('JAX used without use_jax')
+
+    monkeypatch.setattr(basic_models, '_load_wavefunction_jax',
+                        load_wavefunction_jax)
+    test_particle = ParticleBox(1, 2, 2)
+    x = np.linspace(0, 2, 5, dtype=np.float32)
+    wavefunctions = test_particle._calc_wavefunction([1, 1], [1, 1], x, x)
+    assert wavefunctions.dtype == np.float32
+
+
+@pytest.mark.parametrize('lengths, ranges, dimension', [
+    ((2, 3, 4), ([1, 4], [0, 3], [0, 2]), '3d'),
+    ((2, 3, 4), ([1, 4], [0, 0], [0, 0]), '1d'),
+    ((2, 3, 4), ([1, 4], [1, 3], [0, 0]), '2d'),
+    ((2, 3, None), ([1, 4], [0, 3], [0, 2]), '2d'),
+    ((2, None, None), ([1, 4], [0, 3], [0, 2]), '1d'),
+])
+def test_evaluator_dimension(lengths, ranges, dimension):
+    test_particle = ParticleBox(1, *lengths)
+    evaluator = test_particle._make_evaluator(
+        use_y=tuple(ranges[1]) != (0, 0),
+        use_z=tuple(ranges[2]) != (0, 0))
+    assert evaluator.__name__ == f'eigenvalue_{dimension}'
+    test_particle.calc_eigenvalues(*ranges)
+    for state, value in test_particle.iter_eigenvalues(*ranges):
+        assert value == test_particle.get(*state)
+        assert value == test_particle._calc_eigenvalue(*state)
+
+
+@pytest.mark.parametrize('mass, lengths', [
+    (0, (1,)),
+    (None, (2, 2)),
+])
+def test_wavefunction_without_mass(mass, lengths):
+    test_particle = ParticleBox(mass, *lengths)
+    x = np.linspace(0, 1, 5)
+    wavefunctions = test_particle._calc_wavefunction([1, 2], [1, 2], x, x)
+    assert wavefunctions.shape == (2, 2, 5, 5)
+
+
+def test_wavefunction_needs_length_y():
+    test_particle = ParticleBox(1, 2, None, None)
+    x = np.linspace(0, 2, 5)
+    with pytest.raises(ValueError):
+        test_particle._calc_wavefunction([1, 1], [1, 1], x, x)
+    with pytest.raises(ValueError):
+        test_particle.plot_wavefunctions()
+
+
+def test_determine_degeneracy():
+    test_particle = ParticleBox()
+    ranges = ([1, 3], [1, 3], [1, 3])
+    eigenvalues = test_particle.calc_eigenvalues(*ranges)
+    values, degeneracies, state_indices, offsets = (
+        test_particle.determine_degeneracy(eigenvalues))
+    assert values[0] == pytest.approx(1.6464302112270383e-67)
+    assert list(degeneracies[:4]) == [1, 3, 3, 3]
+    assert list(offsets[:5]) == [0, 1, 4, 7, 10]
+    assert offsets[-1] == state_indices.size == eigenvalues.size
+    assert sorted(state_indices) == list(range(eigenvalues.size))
+    assert list(np.diff(offsets)) == list(degeneracies)
+    assert test_particle.degenerate_states(
+        (values, degeneracies, state_indices, offsets), 1, *ranges) == [
+            (1, 1, 2), (1, 2, 1), (2, 1, 1)]
+
+
+def test_degenerate_states_independent_of_last_calculation():
+    test_particle = ParticleBox()
+    ranges = ([1, 3], [1, 3], [1, 3])
+    degeneracy = test_particle.determine_degeneracy(
+        test_particle.calc_eigenvalues(*ranges))
+    test_particle.calc_eigenvalues([5, 7], [5, 7], [5, 7])
+    assert test_particle.degenerate_states(degeneracy, 0, *ranges) == [
+        (1, 1, 1)]
+    with pytest.raises(ValueError):
+        test_particle.degenerate_states(degeneracy, 0, [1, 3], [1, 3])
+
+
+def test_degenerate_states_level():
+    test_particle = ParticleBox()
+    ranges = ([1, 3], [1, 3], [1, 3])
+    degeneracy = test_particle.determine_degeneracy(
+        test_particle.calc_eigenvalues(*ranges))
+    n_levels = len(degeneracy[0])
+    assert test_particle.degenerate_states(degeneracy, -1, *ranges) == [
+        (3, 3, 3)]
+    assert (test_particle.degenerate_states(degeneracy, -n_levels, *ranges)
+            == test_particle.degenerate_states(degeneracy, 0, *ranges))
+    for level in [n_levels, -n_levels - 1]:
+        with pytest.raises(IndexError):
+            test_particle.degenerate_states(degeneracy, level, *ranges)
+
+
+def test_determine_degeneracy_tolerance():
+    # E ~ 9 i^2 + j^2 + k^2, y and z terms are rounded separately
+    test_particle = ParticleBox(1, 1, 3, 3)
+    ranges = ([1, 8], [1, 20], [1, 20])
+    eigenvalues = test_particle.calc_eigenvalues(*ranges)
+    sums_of_squares = {9*i*i + j*j + k*k
+                       for i in range(1, 9)
+                       for j in range(1, 21)
+                       for k in range(1, 21)}
+    values, degeneracies, _, _ = test_particle.determine_degeneracy(
+        eigenvalues)
+    assert len(values) == len(sums_of_squares)
+    assert degeneracies.sum() == eigenvalues.size
+    np.testing.assert_array_equal(
+        test_particle.determine_discrete_eigenvalues(eigenvalues), values)
+
+    perturbed = eigenvalues * (1 + 1e-15 * np.random.default_rng(0).random(
+        eigenvalues.shape))
+    perturbed_degeneracies = test_particle.determine_degeneracy(perturbed)[1]
+    np.testing.assert_array_equal(perturbed_degeneracies, degeneracies)
+    assert len(test_particle.determine_degeneracy(perturbed, rtol=0)[0]) > (
+        len(values))
+
+
+@pytest.mark.parametrize('lengths', [(1, 1), (2, 3), (0.5, 4)])
+def test_wavefunction_normalisation(lengths):
+    test_particle = ParticleBox(1, *lengths)
+    x = np.linspace(0, lengths[0], 401)
+    y = np.linspace(0, lengths[1], 301)
+    wavefunctions = test_particle._calc_wavefunction([1, 3], [1, 2], x, y)
+    integrals = ((wavefunctions ** 2).sum(axis=(2, 3))
+                 * (x[1] - x[0]) * (y[1] - y[0]))
+    np.testing.assert_allclose(integrals, 1.0)
+
+
+@pytest.mark.parametrize('target_unit, number, unit, expected', [
+    ('J', 1.0, 'eV', 1.602176634e-19),
+    ('eV', 1.0, 'Hartree', 27.211386245981),
+    ('cm^-1', 1.0, 'eV', 8065.543937),
+    ('kJ/mol', 1.0, 'kcal/mol', 4.184),
+    ('eV', 96.485332, 'kJ/mol', 1.0),
+    ('J', 2.5, 'J', 2.5),
+])
+def test_convert_unit(target_unit, number, unit, expected):
+    assert convert_unit(target_unit, number, unit) == pytest.approx(expected)
+
+
+def test_convert_unit_arrays():
+    eigenvalues = ParticleBox(9.1093837015e-31, 1e-9).calc_eigenvalues([1, 3])
+    converted = convert_unit('eV', eigenvalues)
+    assert converted.shape == eigenvalues.shape
+    np.testing.assert_allclose(converted.ravel(),
+                               [0.376, 1.504, 3.384], rtol=1e-3)
+    np.testing.assert_allclose(convert_unit('J', converted, 'eV'),
+                               eigenvalues)
+
+
+@pytest.mark.parametrize('target_unit, unit', [('eV', 'erg'), ('kJ', 'J')])
+def test_convert_unit_unknown_unit(target_unit, unit):
+    with pytest.raises(ValueError):
+        convert_unit(target_unit, 1.0, unit)
+
+
+FILL_EIGENVALUES_ARGUMENTS = [((5, 6, 7), (1, 0, 2), (1, 2, 3)),
+                              ((20, 20, 20), (1, 1, 1), (3, 3, 3)),
+                              ((4, 1, 1), (-2, 0, 0), (0.7, 1, 1))]
+
+
+def _fill_eigenvalues_reference(shape, starts, lengths):
+    eigenvalues = np.empty(shape)
+    basic_models._fill_eigenvalues_numpy(
+        eigenvalues, *basic_models._calc_coefficients(1, *lengths), *starts)
+    return eigenvalues
+
+
+@pytest.mark.parametrize('shape, starts, lengths', FILL_EIGENVALUES_ARGUMENTS)
+def test_fill_eigenvalues_selected_backend(shape, starts, lengths):
+    eigenvalues = np.empty(shape)
+    basic_models._load_fill_eigenvalues()(
+        eigenvalues, *basic_models._calc_coefficients(1, *lengths), *starts)
+    np.testing.assert_array_equal(
+        eigenvalues, _fill_eigenvalues_reference(shape, starts, lengths))
+
+
+@pytest.mark.parametrize('shape, starts, lengths', FILL_EIGENVALUES_ARGUMENTS)
+def test_fill_eigenvalues_numba(shape, starts, lengths):
+    pytest.importorskip('numba')
+    fill_eigenvalues = basic_models._load_numba_kernel()
+    eigenvalues = np.empty(shape)
+    fill_eigenvalues(
+        eigenvalues, *basic_models._calc_coefficients(1, *lengths), *starts)
+    np.testing.assert_array_equal(
+        eigenvalues, _fill_eigenvalues_reference(shape, starts, lengths))
+
+
+@pytest.mark.parametrize('ranges', [([-2, -5], [0, 0], [0, 0]),
+                                    ([3, 1], [0, 0], [0, 0]),
+                                    ([1, 3], [2, 1], [0, 0])])
+def test_empty_ranges(ranges):
+    test_particle = ParticleBox()
+    assert list(test_particle.iter_eigenvalues(*ranges)) == []
+    assert test_particle.top_k(3, *ranges) == []
+
+
+@pytest.mark.parametrize('shape, starts, lengths', FILL_EIGENVALUES_ARGUMENTS)
+def test_fill_eigenvalues_cython(shape, starts, lengths):
+    pytest.importorskip('_eigen_kernel')
+    fill_eigenvalues = basic_models._load_cython_kernel()
+    assert fill_eigenvalues is not None
+    eigenvalues = np.empty(shape)
+    fill_eigenvalues(
+        eigenvalues, *basic_models._calc_coefficients(1, *lengths), *starts)
+    np.testing.assert_array_equal(
+        eigenvalues, _fill_eigenvalues_reference(shape, starts, lengths))
+
+
+def test_clear_cache():
+    test_particle = ParticleBox(1, 2, 2, 2)
+    eigenvalues = test_particle.calc_eigenvalues([1, 3], [1, 3], [1, 3])
+    assert test_particle.calc_eigenvalues([1, 3], [1, 3], [1, 3]) is eigenvalues
+
+    basic_models.clear_cache()
+    recalculated = test_particle.calc_eigenvalues([1, 3], [1, 3], [1, 3])
+    assert recalculated is not eigenvalues
+    np.testing.assert_array_equal(recalculated, eigenvalues)
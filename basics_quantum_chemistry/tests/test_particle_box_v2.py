@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+
+from basic_models_v2 import (ParticleBox_1D, ParticleBox_2D, ParticleBox_3D,
+                             ParticleBox_multiD)
+
+
+def test_ParticleBox_1D_calc_multi_eigenvalues():
+    test_particle = ParticleBox_1D(1, 2)
+    eigenvalues = test_particle.calc_multi_eigenvalues((1, 4))
+    assert list(eigenvalues) == [1, 2, 3, 4]
+    for n, value in eigenvalues.items():
+        assert value == test_particle.calc_single_eigenvalue(n)
+
+
+@pytest.mark.parametrize('length, n_i', [((1,), ([1, 3],)),
+                                         ((1, 2), ([1, 3], [0, 2])),
+                                         ((1, 2, 3), ([1, 3], [1, 4], [2, 3]))])
+def test_ParticleBox_multiD_calc_multi_eigenvalues(length, n_i):
+    test_particle = ParticleBox_multiD(1, length)
+    eigenvalues = test_particle.calc_multi_eigenvalues(*n_i)
+    states = list(itertools.product(*[range(n[0], n[1] + 1) for n in n_i]))
+    assert list(eigenvalues) == states
+    for state in states:
+        assert eigenvalues[state] == pytest.approx(
+            test_particle.calc_single_eigenvalue(state), rel=1e-14)
+
+
+def test_ParticleBox_multiD_calc_multi_eigenvalues_wrong_dimension():
+    test_particle = ParticleBox_multiD(1, (1, 1))
+    with pytest.raises(ValueError):
+        test_particle.calc_multi_eigenvalues([1, 2], [1, 2], [1, 3])
+    with pytest.raises(ValueError):
+        test_particle.calc_multi_eigenvalues([1, 2])
+
+
+def test_ParticleBox_multiD_determine_degeneracy():
+    test_particle = ParticleBox_multiD(1, (1, 1, 1))
+    eigenvalues = test_particle.calc_multi_eigenvalues([1, 4], [1, 4], [1, 4])
+    expected = []
+    for value in sorted(set(eigenvalues.values())):
+        states = [state for state, other in eigenvalues.items()
+                  if other == value]
+        expected.append([value, len(states), states])
+    degeneracy = test_particle.determine_degeneracy(eigenvalues)
+    assert degeneracy == expected
+    assert degeneracy[1][1:] == [3, [(1, 1, 2), (1, 2, 1), (2, 1, 1)]]
+
+
+@pytest.mark.parametrize('particle', [ParticleBox_1D(1, 1),
+                                      ParticleBox_multiD(1, (1, 1)),
+                                      ParticleBox_2D(1, (1, 1)),
+                                      ParticleBox_3D(1, (1, 1, 1))])
+def test_slots(particle):
+    assert not hasattr(particle, '__dict__')
+    with pytest.raises(AttributeError):
+        particle.eigenvalues = {}